@@ -1,13 +1,30 @@
 import os
 import re
+import json
+import hashlib
 import yaml
 import logging
 from datetime import datetime, date
-from typing import List, Dict, Any
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 import ebooklib
 from ebooklib import epub
-from markdown import markdown
-import glob
+from markdown import Markdown
+
+# mistune is optional; it renders markdown noticeably faster than python-markdown
+try:
+    import mistune
+except ImportError:
+    mistune = None
+# mistune 0.8.x (still pulled in by older Jupyter setups) has a different API
+if mistune is not None and not hasattr(mistune, 'create_markdown'):
+    mistune = None
+
+# orjson is optional; it reads and writes the chapter cache faster than json
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Set up logging
 logging.basicConfig(
@@ -16,15 +33,224 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns used while cleaning up chapter HTML
+# An h1 header line together with the line after it (usually the date)
+_TITLE_DATE_RE = re.compile(r'^# [^\n]*(?:\n[^\n]*)?\n?', re.MULTILINE)
+_BARE_DATE_LINE_RE = re.compile(r'^[ \t]*\d{4}-\d{2}-\d{2}[ \t]*(?:\n|$)', re.MULTILINE)
+# Empty elements, leading indentation and blank lines, removed in one scan
+_CLEANUP_RE = re.compile(r'<[^>]*>\s*</[^>]*>\s*|^[ \t]+|\n\s*\n', re.MULTILINE)
+_LJ_BLOG_RE = re.compile(r'https?://([^.]+)\.livejournal\.com')
+
+# Marker left in chapter content until the neighbouring chapters are known
+_NAV_PLACEHOLDER = '<!--NAV-->'
+
+# Boilerplate shared by every chapter
+_SPACER_HTML = '<div class="spacer"><p></p></div>'
+_URL_SECTION_HTML = '<div class="url-section"><div class="url-container"><a href="{url}" class="post-url">{url}</a></div></div>'
+_EMPTY_NAV = ''
+
+# Prefer the libyaml C loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Front matter written by the scraper is a flat list of "key: value" lines
+_FRONTMATTER_LINE_RE = re.compile(r'([A-Za-z_][A-Za-z0-9_-]*):[ \t]*(.*)')
+_DATE_VALUE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+# Plain values YAML would give another meaning to (numbers, booleans, nulls,
+# quoting, flow collections, anchors, comments, ...)
+_YAML_SPECIAL_RE = re.compile(r'[-+.\d~\[\]{}&*!|>\'"%@`#,?:]|(?:null|true|false|yes|no|on|off)$', re.IGNORECASE)
+
+# Bump when the chapter HTML produced for the same markdown changes
+_CACHE_VERSION = '1'
+
+# One converter per process, so the extension pipeline is only built once
+if mistune is not None:
+    _render_markdown = mistune.create_markdown(escape=False, plugins=['table', 'strikethrough', 'footnotes'])
+else:
+    _markdown = Markdown(extensions=['extra'])
+
+    def _render_markdown(text: str) -> str:
+        return _markdown.reset().convert(text)
+
+def _fast_frontmatter(text: str) -> Optional[Dict[str, Any]]:
+    """Parse simple front matter without PyYAML.
+
+    Returns None when the block contains anything beyond plain
+    "key: value" lines, so the caller can fall back to the YAML parser.
+    """
+    metadata = {}
+    for line in text.split('\n'):
+        match = _FRONTMATTER_LINE_RE.fullmatch(line.rstrip())
+        if not match:
+            return None
+        key, value = match.groups()
+        if _DATE_VALUE_RE.fullmatch(value):
+            try:
+                metadata[key] = date.fromisoformat(value)
+            except ValueError:
+                return None
+        elif value.startswith('[') and value.endswith(']'):
+            # Flow list of plain items, e.g. "tags: [a, b, c]"
+            items = [item.strip() for item in value[1:-1].split(',')]
+            if any(not item or _YAML_SPECIAL_RE.match(item) or ': ' in item for item in items):
+                return None
+            metadata[key] = items
+        elif not value or _YAML_SPECIAL_RE.match(value) or ': ' in value or ' #' in value or value.endswith(':'):
+            return None
+        else:
+            metadata[key] = value
+    return metadata
+
+def _split_frontmatter(content: str) -> Tuple[Dict[str, Any], str]:
+    """Split markdown content into its YAML front matter and body."""
+    metadata = {}
+    if content.startswith('---'):
+        # Find the end of YAML front matter
+        end_yaml = content.find('---', 3)
+        if end_yaml != -1:
+            yaml_content = content[3:end_yaml].strip()
+            try:
+                metadata = _fast_frontmatter(yaml_content)
+                if metadata is None:
+                    metadata = yaml.load(yaml_content, Loader=_YAML_LOADER) or {}
+            except Exception as e:
+                logger.error(f"Error parsing YAML metadata: {str(e)}")
+            content = content[end_yaml + 3:].strip()
+    return metadata, content
+
+def _strip_tag(html: str, open_prefix: str, close_tag: str) -> str:
+    """Remove every element that starts with open_prefix, up to its close_tag."""
+    start = html.find(open_prefix)
+    if start == -1:
+        return html
+    parts = []
+    pos = 0
+    while start != -1:
+        end = html.find(close_tag, start)
+        if end == -1:
+            break
+        parts.append(html[pos:start])
+        pos = end + len(close_tag)
+        start = html.find(open_prefix, pos)
+    parts.append(html[pos:])
+    return ''.join(parts)
+
+def _cleanup_html(html: str) -> str:
+    """Remove empty elements and collapse whitespace in generated HTML."""
+    html = _CLEANUP_RE.sub(lambda m: '\n' if m.group(0).startswith('\n') else '', html)
+    return html.strip()
+
+def _render_chapter_html(title: str, content: str, date: str, url: str = "") -> str:
+    """Render a markdown post body (without front matter) to chapter HTML."""
+    # Remove markdown headers and dates
+    content = _TITLE_DATE_RE.sub('', content)
+    content = _BARE_DATE_LINE_RE.sub('', content)
+    
+    # Skip lines containing the URL from metadata
+    if url and url in content:
+        content = '\n'.join(line for line in content.split('\n') if url not in line)
+    
+    # Convert markdown to HTML
+    html_content = _render_markdown(content)
+    
+    # Remove any remaining h1 and date elements
+    html_content = _strip_tag(html_content, '<h1', '</h1>')
+    html_content = _strip_tag(html_content, '<p class="date">', '</p>')
+    
+    # Remove any raw text that matches the title or date
+    if title in html_content:
+        html_content = html_content.replace(title, '')
+    if date in html_content:
+        html_content = html_content.replace(date, '')
+    
+    # Remove any links that contain the URL
+    if url and url in html_content:
+        html_content = re.sub(f'<a[^>]*>{re.escape(url)}</a>', '', html_content)
+        html_content = re.sub(f'<a[^>]*href="{re.escape(url)}"[^>]*>.*?</a>', '', html_content)
+    
+    html_content = html_content.strip()  # Remove leading/trailing whitespace
+    
+    # Remove the first paragraph tag if it exists
+    if html_content.startswith('<p>'):
+        html_content = html_content[3:]
+    if html_content.endswith('</p>'):
+        html_content = html_content[:-4]
+    
+    parts = [f'<h1 id="top">{title}</h1>', f'<p class="date">{date}</p>']
+    
+    # Add URL section with a clear separator
+    if url:
+        parts.append(_URL_SECTION_HTML.format(url=url))
+    
+    parts.append(_SPACER_HTML)
+    parts.append(f'<div class="post-content">\n{html_content}\n</div>')
+    parts.append(_NAV_PLACEHOLDER)
+    content = '\n'.join(parts)
+    
+    # Remove any empty elements and clean up whitespace
+    return _cleanup_html(content)
+
+def _cache_key(content: str) -> str:
+    """Return the chapter cache key for the raw markdown of a post."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{_CACHE_VERSION}:{'mistune' if mistune else 'markdown'}:".encode('utf-8'))
+    h.update(content.encode('utf-8'))
+    return h.hexdigest()
+
+def _read_post(md_file: str) -> Optional[str]:
+    """Read one markdown file, or return None if it can't be read."""
+    try:
+        with open(md_file, 'r', encoding='utf-8') as f:
+            return f.read()
+    except Exception as e:
+        logger.error(f"Error reading {md_file}: {str(e)}")
+        return None
+
+def _render_post(md_file: str, content: Optional[str]) -> Optional[Tuple[Dict[str, Any], str, str, str]]:
+    """Render the content of one markdown file.
+
+    Returns (metadata, chapter_html, post_date, post_year), or None if the
+    file could not be processed. Runs in a worker process, so it must not
+    touch the EPUBBuilder or any ebooklib objects.
+    """
+    if content is None:
+        return None
+    try:
+        # Parse metadata and split off the post body
+        metadata, body = _split_frontmatter(content)
+        if not metadata:
+            logger.warning(f"No metadata found in {md_file}")
+            return None
+
+        # Get post date and year
+        post_date = metadata.get('date', 'Unknown Date')
+        if isinstance(post_date, (datetime, date)):
+            post_year = str(post_date.year)
+            post_date = post_date.strftime('%Y-%m-%d')
+        else:
+            # Try to extract year from the date string
+            try:
+                post_year = post_date.split('-')[0] if '-' in post_date else 'Unknown'
+            except:
+                post_year = 'Unknown'
+
+        title = metadata.get('title', 'Untitled')
+        html = _render_chapter_html(title, body, post_date, metadata.get('url', ''))
+        return metadata, html, post_date, post_year
+    except Exception as e:
+        logger.error(f"Error processing {md_file}: {str(e)}")
+        return None
+
 class EPUBBuilder:
     def __init__(self, posts_dir: str = "posts", output_dir: str = "epub"):
         self.posts_dir = posts_dir
         self.output_dir = output_dir
         self.book = epub.EpubBook()
         
-        # Create output directory if it doesn't exist
-        if not os.path.exists(self.output_dir):
-            os.makedirs(self.output_dir)
+        # Rendered chapters are cached by content hash between runs
+        self.cache_dir = os.path.join(self.output_dir, '.chapter_cache')
+
+        # Create output and cache directories if they don't exist
+        os.makedirs(self.cache_dir, exist_ok=True)
             
         # Set default metadata
         self.book.set_identifier('lj-scraper-epub')
@@ -32,323 +258,231 @@ class EPUBBuilder:
         self.book.set_language('ru')
         self.book.add_author('evo-lutio')
 
+    def _load_cached_chapter(self, key: Optional[str]) -> Optional[Tuple[Dict[str, Any], str, str, str]]:
+        """Return a previously rendered post from the chapter cache, if present."""
+        if key is None:
+            return None
+        try:
+            with open(os.path.join(self.cache_dir, f'{key}.json'), 'rb') as f:
+                data = f.read()
+            info = orjson.loads(data) if orjson is not None else json.loads(data)
+            with open(os.path.join(self.cache_dir, f'{key}.xhtml'), 'r', encoding='utf-8') as f:
+                html = f.read()
+            return info['metadata'], html, info['date'], info['year']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _store_cached_chapter(self, key: str, result: Tuple[Dict[str, Any], str, str, str]) -> None:
+        """Save a rendered post to the chapter cache."""
+        metadata, html, post_date, post_year = result
+        info = {
+            # Only the fields build_epub needs; dates etc. aren't JSON serializable
+            'metadata': {k: metadata[k] for k in ('title', 'url', 'tags') if k in metadata},
+            'date': post_date,
+            'year': post_year,
+        }
+        try:
+            with open(os.path.join(self.cache_dir, f'{key}.xhtml'), 'w', encoding='utf-8') as f:
+                f.write(html)
+            # Written last, so a chapter is only used once both files are complete
+            if orjson is not None:
+                data = orjson.dumps(info)
+            else:
+                data = json.dumps(info, ensure_ascii=False).encode('utf-8')
+            with open(os.path.join(self.cache_dir, f'{key}.json'), 'wb') as f:
+                f.write(data)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not cache chapter {key}: {str(e)}")
+
     def parse_markdown_metadata(self, content: str) -> Dict[str, Any]:
         """Extract YAML front matter from markdown content."""
-        metadata = {}
-        if content.startswith('---'):
-            try:
-                # Find the end of YAML front matter
-                end_yaml = content.find('---', 3)
-                if end_yaml != -1:
-                    yaml_content = content[3:end_yaml].strip()
-                    metadata = yaml.safe_load(yaml_content)
-            except Exception as e:
-                logger.error(f"Error parsing YAML metadata: {str(e)}")
+        metadata, _ = _split_frontmatter(content)
         return metadata
 
     def convert_markdown_to_html(self, content: str) -> str:
         """Convert markdown content to HTML."""
         # Remove YAML front matter if present
-        if content.startswith('---'):
-            end_yaml = content.find('---', 3)
-            if end_yaml != -1:
-                content = content[end_yaml + 3:].strip()
+        _, content = _split_frontmatter(content)
         
         # Remove the first h1 and date paragraph if they exist
-        lines = content.split('\n')
-        filtered_lines = []
-        skip_next = False
-        
-        for line in lines:
-            if skip_next:
-                skip_next = False
-                continue
-                
-            # Skip h1 headers
-            if line.startswith('# '):
-                skip_next = True  # Skip the next line (usually the date)
-                continue
-                
-            # Skip date lines
-            if re.match(r'^\d{4}-\d{2}-\d{2}$', line.strip()):
-                continue
-                
-            filtered_lines.append(line)
-        
-        content = '\n'.join(filtered_lines)
+        content = _TITLE_DATE_RE.sub('', content)
+        content = _BARE_DATE_LINE_RE.sub('', content)
         
         # Convert markdown to HTML
-        html = markdown(content, extensions=['extra'])
+        html = _render_markdown(content)
         return html
 
-    def create_chapter(self, title: str, content: str, date: str, prev_post: tuple = None, next_post: tuple = None) -> epub.EpubHtml:
-        """Create an EPUB chapter from markdown content."""
-        # Extract URL from metadata if present
-        url = ""
-        if content.startswith('---'):
-            end_yaml = content.find('---', 3)
-            if end_yaml != -1:
-                yaml_content = content[3:end_yaml].strip()
-                try:
-                    metadata = yaml.safe_load(yaml_content)
-                    url = metadata.get('url', '')
-                except:
-                    pass
-        
-        # Get content after YAML front matter
-        if content.startswith('---'):
-            end_yaml = content.find('---', 3)
-            if end_yaml != -1:
-                content = content[end_yaml + 3:].strip()
-        
-        # Remove markdown headers and dates
-        lines = content.split('\n')
-        filtered_lines = []
-        skip_next = False
-        
-        for line in lines:
-            if skip_next:
-                skip_next = False
-                continue
-                
-            # Skip h1 headers
-            if line.startswith('# '):
-                skip_next = True  # Skip the next line (usually the date)
-                continue
-                
-            # Skip date lines
-            if re.match(r'^\d{4}-\d{2}-\d{2}$', line.strip()):
-                continue
-                
-            # Skip URL if it matches the one from metadata
-            if url and (line.strip() == url or url in line):
-                continue
-                
-            filtered_lines.append(line)
-        
-        content = '\n'.join(filtered_lines)
-        
-        # Convert markdown to HTML
-        html_content = markdown(content, extensions=['extra'])
-        
-        # Remove any remaining h1 and date elements
-        html_content = re.sub(r'<h1[^>]*>.*?</h1>', '', html_content)
-        html_content = re.sub(r'<p class="date">.*?</p>', '', html_content)
-        
-        # Remove any raw text that matches the title or date
-        html_content = re.sub(re.escape(title), '', html_content)
-        html_content = re.sub(re.escape(date), '', html_content)
-        
-        # Remove any links that contain the URL
-        if url:
-            html_content = re.sub(f'<a[^>]*>{re.escape(url)}</a>', '', html_content)
-            html_content = re.sub(f'<a[^>]*href="{re.escape(url)}"[^>]*>.*?</a>', '', html_content)
-        
-        # Remove empty HTML elements and clean up whitespace
-        html_content = re.sub(r'<[^>]*>\s*</[^>]*>', '', html_content)
-        html_content = re.sub(r'^\s+', '', html_content, flags=re.MULTILINE)  # Remove leading whitespace
-        html_content = re.sub(r'\n\s*\n', '\n', html_content)  # Remove empty lines
-        html_content = html_content.strip()  # Remove leading/trailing whitespace
-        
-        # Remove the first paragraph tag if it exists
-        if html_content.startswith('<p>'):
-            html_content = html_content[3:]
-        if html_content.endswith('</p>'):
-            html_content = html_content[:-4]
-        
-        # Create navigation links
+    def create_navigation(self, prev_post: tuple = None, next_post: tuple = None) -> str:
+        """Create the navigation links between neighbouring chapters."""
+        if not prev_post and not next_post:
+            return _EMPTY_NAV
         nav_links = '<div class="post-navigation">'
         if prev_post:
             nav_links += f'<a href="{prev_post[1]}" class="nav-link prev">← {prev_post[0]}</a>'
         if next_post:
             nav_links += f'<a href="{next_post[1]}" class="nav-link next">{next_post[0]} →</a>'
         nav_links += '</div>'
-        
-        # Create chapter
+        return nav_links
+
+    def finalize_chapter(self, chapter: epub.EpubHtml, prev_post: tuple = None, next_post: tuple = None) -> None:
+        """Replace a chapter's navigation placeholder with links to its neighbours."""
+        chapter.content = chapter.content.replace(_NAV_PLACEHOLDER, self.create_navigation(prev_post, next_post))
+
+    def create_chapter(self, title: str, content: str, date: str, url: str = "") -> epub.EpubHtml:
+        """Create an EPUB chapter from a markdown post body (without front matter)."""
         chapter = epub.EpubHtml(title=title, file_name=f'chapter_{date}.xhtml')
-        
-        # Create URL section with a clear separator
-        url_section = ''
-        if url:
-            url_section = f'''
-                <div class="url-section">
-                    <div class="url-container">
-                        <a href="{url}" class="post-url">{url}</a>
-                    </div>
-                </div>
-            '''
-        
-        # Clean up any remaining empty elements and whitespace
-        content = f'''
-            <h1 id="top">{title}</h1>
-            <p class="date">{date}</p>
-            {url_section}
-            <div class="spacer">
-            <p></p>
-            </div>
-            <div class="post-content">
-                {html_content}
-            </div>
-        '''
-        
-        # Remove any empty elements and clean up whitespace
-        content = re.sub(r'<[^>]*>\s*</[^>]*>', '', content)
-        content = re.sub(r'^\s+', '', content, flags=re.MULTILINE)
-        content = re.sub(r'\n\s*\n', '\n', content)
-        content = content.strip()
-        
-        chapter.content = content
-        
+        # Navigation links are filled in by build_epub once all chapters exist
+        chapter.content = _render_chapter_html(title, content, date, url)
         return chapter
 
     def create_tag_posts_page(self, tag: str, posts: list) -> epub.EpubHtml:
         """Create a page listing all posts for a specific tag."""
-        html_content = f'<h1>Posts tagged with: {tag}</h1>'
-        html_content += '<div class="back-link"><a href="tags.xhtml">← Back to Tags</a></div>'
-        html_content += '<ul class="tag-posts">'
+        parts = [f'<h1>Posts tagged with: {tag}</h1>']
+        parts.append('<div class="back-link"><a href="tags.xhtml">← Back to Tags</a></div>')
+        parts.append('<ul class="tag-posts">')
         
         # Sort posts by date (assuming the filename contains the date)
         sorted_posts = sorted(posts, key=lambda x: x[1], reverse=True)
         
         for post_title, post_file in sorted_posts:
-            html_content += f'<li><a href="{post_file}">{post_title}</a></li>'
+            parts.append(f'<li><a href="{post_file}">{post_title}</a></li>')
         
-        html_content += '</ul>'
+        parts.append('</ul>')
         
         # Create the tag posts page
         tag_page = epub.EpubHtml(title=f'Posts: {tag}', file_name=f'tag_{tag}.xhtml')
-        tag_page.content = html_content
+        tag_page.content = ''.join(parts)
         
         return tag_page
 
-    def create_toc_page(self, posts_by_year: dict, all_tags: set = None, tag_to_posts: dict = None) -> epub.EpubHtml:
-        """Create a table of contents page organized by year."""
-        html_content = '<h1>Table of Contents</h1>'
+    def create_toc_page(self, sorted_years: list, sorted_tags: list = None) -> epub.EpubHtml:
+        """Create a table of contents page organized by year (newest first)."""
+        parts = ['<h1>Table of Contents</h1>']
         
         # Add link to Tags page if tags exist
-        if all_tags:
-            html_content += '<div class="toc-section">'
-            html_content += '<h2><a href="tags.xhtml">Tags</a></h2>'
-            html_content += '</div>'
+        if sorted_tags:
+            parts.append('<div class="toc-section">')
+            parts.append('<h2><a href="tags.xhtml">Tags</a></h2>')
+            parts.append('</div>')
         
         # Add posts by year
-        html_content += '<div class="toc-section">'
-        html_content += '<h2>Posts by Year</h2>'
-        for year, posts in sorted(posts_by_year.items(), reverse=True):
-            html_content += f'<div class="toc-year">'
-            html_content += f'<h3>{year}</h3>'
-            html_content += '<ul class="toc-posts">'
+        parts.append('<div class="toc-section">')
+        parts.append('<h2>Posts by Year</h2>')
+        for year, posts in sorted_years:
+            parts.append(f'<div class="toc-year">')
+            parts.append(f'<h3>{year}</h3>')
+            parts.append('<ul class="toc-posts">')
             
             for post_title, post_file in posts:
-                html_content += f'<li><a href="{post_file}">{post_title}</a></li>'
+                parts.append(f'<li><a href="{post_file}">{post_title}</a></li>')
             
-            html_content += '</ul></div>'
-        html_content += '</div>'
+            parts.append('</ul></div>')
+        parts.append('</div>')
         
         toc_page = epub.EpubHtml(title='Table of Contents', file_name='toc.xhtml')
-        toc_page.content = html_content
+        toc_page.content = ''.join(parts)
         
         return toc_page
 
-    def create_tags_page(self, tags: set, tag_to_posts: dict) -> epub.EpubHtml:
+    def create_tags_page(self, sorted_tags: list, tag_freq: dict) -> epub.EpubHtml:
         """Create the main tags page with clickable tags."""
-        # Sort tags alphabetically
-        sorted_tags = sorted(tags)
-        
         # Create HTML content for tags page
-        html_content = '<h1>Tags</h1>'
-        html_content += '<div class="back-link"><a href="toc.xhtml">← Back to Table of Contents</a></div>'
-        html_content += '<div class="tags-cloud">'
+        parts = ['<h1>Tags</h1>']
+        parts.append('<div class="back-link"><a href="toc.xhtml">← Back to Table of Contents</a></div>')
+        parts.append('<div class="tags-cloud">')
         
         for tag in sorted_tags:
-            freq = len(tag_to_posts[tag])
-            html_content += f'<div class="tag">'
-            html_content += f'<a href="tag_{tag}.xhtml">{tag}</a>'
-            html_content += f'<span class="tag-count">({freq})</span>'
-            html_content += '</div>'
+            freq = tag_freq[tag]
+            parts.append(f'<div class="tag">')
+            parts.append(f'<a href="tag_{tag}.xhtml">{tag}</a>')
+            parts.append(f'<span class="tag-count">({freq})</span>')
+            parts.append('</div>')
         
-        html_content += '</div>'
+        parts.append('</div>')
         
         # Create the tags page
         tags_page = epub.EpubHtml(title='Tags', file_name='tags.xhtml')
-        tags_page.content = html_content
+        tags_page.content = ''.join(parts)
         
         return tags_page
 
     def build_epub(self, year: str = None) -> str:
         """Build EPUB from markdown files."""
-        # Get all markdown files
-        pattern = os.path.join(self.posts_dir, '*.md')
-        if year:
-            pattern = os.path.join(self.posts_dir, f'{year}-*.md')
-        
-        md_files = sorted(glob.glob(pattern))
+        # Get all markdown files (optionally only those from the given year)
+        prefix = f'{year}-' if year else ''
+        try:
+            with os.scandir(self.posts_dir) as entries:
+                names = [entry.name for entry in entries
+                         if entry.name.endswith('.md') and entry.name.startswith(prefix)
+                         and not entry.name.startswith('.') and entry.is_file()]
+        except FileNotFoundError:
+            names = []
+        names.sort()
+        md_files = [os.path.join(self.posts_dir, name) for name in names]
         if not md_files:
             logger.warning(f"No markdown files found in {self.posts_dir}")
             return None
 
         # Process each markdown file
-        chapters = []
+        chapters = []  # (title, file_name, id) of every chapter, in reading order
+        pending = None  # Last chapter created, still waiting for its next_post link
         toc_items = []
         all_tags = set()
         blog_name = None
         tag_to_posts = {}  # Dictionary to map tags to posts
         posts_by_year = {}  # Dictionary to organize posts by year
 
-        for md_file in md_files:
-            try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-
-                # Parse metadata
-                metadata = self.parse_markdown_metadata(content)
-                if not metadata:
-                    logger.warning(f"No metadata found in {md_file}")
-                    continue
+        # Reading is I/O bound, so overlap the reads (and cache lookups) in threads
+        with ThreadPoolExecutor(max_workers=16) as reader:
+            contents = list(reader.map(_read_post, md_files))
+            keys = [_cache_key(content) if content is not None else None for content in contents]
+            results = list(reader.map(self._load_cached_chapter, keys))
+
+        # Markdown rendering is CPU bound, so spread the cache misses over worker processes
+        misses = [i for i, result in enumerate(results) if result is None and contents[i] is not None]
+        miss_contents = [contents[i] for i in misses]
+        del contents  # Only the cache misses still need their markdown
+        if misses:
+            with ProcessPoolExecutor() as executor:
+                rendered = executor.map(_render_post, [md_files[i] for i in misses],
+                                        miss_contents, chunksize=16)
+                del miss_contents  # Handed over to the workers
+                for i, result in zip(misses, rendered):
+                    results[i] = result
+                    if result is not None:
+                        self._store_cached_chapter(keys[i], result)
+            logger.info(f"Rendered {len(misses)} of {len(md_files)} posts, the rest came from the chapter cache")
+
+        for i, md_file in enumerate(md_files):
+            # Release each rendered post as it's used, so only the chapters hold the HTML
+            result, results[i] = results[i], None
+            if result is None:
+                continue
+            metadata, html, post_date, post_year = result
 
+            try:
                 # Extract blog name from URL if not already set
                 if not blog_name and 'url' in metadata:
                     url = metadata['url']
-                    match = re.search(r'https?://([^.]+)\.livejournal\.com', url)
+                    match = _LJ_BLOG_RE.search(url)
                     if match:
                         blog_name = match.group(1).replace('-', '_')
 
-                # Get post date and year
-                post_date = metadata.get('date', 'Unknown Date')
-                if isinstance(post_date, (datetime, date)):
-                    post_year = str(post_date.year)
-                    post_date = post_date.strftime('%Y-%m-%d')
-                else:
-                    # Try to extract year from the date string
-                    try:
-                        post_year = post_date.split('-')[0] if '-' in post_date else 'Unknown'
-                    except:
-                        post_year = 'Unknown'
-                
-                # Precompute nav info
-                prev_post = (chapters[-1].title, chapters[-1].file_name) if chapters else None
-
-                # Store title and filename in advance (for next_post assignment)
-                chapter_title = metadata.get('title', 'Untitled')
-                chapter_filename = f'chapter_{post_date}.xhtml'
-
-                # next_post will be set later (once next chapter is created)
-
                 # Create chapter
-                chapter = self.create_chapter(
-                    chapter_title,
-                    content,
-                    post_date,
-                    prev_post=prev_post,
-                    next_post=None  # temporary
-                )
+                chapter = epub.EpubHtml(title=metadata.get('title', 'Untitled'), file_name=f'chapter_{post_date}.xhtml')
+                chapter.content = html
 
                 # Add chapter and track
-                chapter.file_name = chapter_filename
-                chapters.append(chapter)
                 self.book.add_item(chapter)
                 toc_items.append(epub.Link(chapter.file_name, chapter.title, chapter.id))
-                
+
+                # The previous chapter's neighbours are now known, so finish it
+                if pending:
+                    prev_post = chapters[-2][:2] if len(chapters) > 1 else None
+                    self.finalize_chapter(pending, prev_post, (chapter.title, chapter.file_name))
+                pending = chapter
+                chapters.append((chapter.title, chapter.file_name, chapter.id))
+            
                 # Organize posts by year
                 if post_year not in posts_by_year:
                     posts_by_year[post_year] = []
@@ -361,7 +495,7 @@ class EPUBBuilder:
                     else:
                         tags = metadata['tags']
                     all_tags.update(tags)
-                    
+                
                     # Map tags to posts
                     for tag in tags:
                         if tag not in tag_to_posts:
@@ -376,35 +510,33 @@ class EPUBBuilder:
             logger.error("No chapters were created")
             return None
 
-        # Update next_post for all chapters except the last one
-        for i in range(len(chapters) - 1):
-            next_post = (chapters[i + 1].title, chapters[i + 1].file_name)
-            # Update the chapter content with proper next_post
-            chapter = self.create_chapter(
-                chapters[i].title,
-                chapters[i].content,
-                chapters[i].file_name.split('_')[1].split('.')[0],
-                prev_post=(chapters[i-1].title, chapters[i-1].file_name) if i > 0 else None,
-                next_post=next_post
-            )
-            chapters[i].content = chapter.content
+        # The last chapter has no next_post
+        self.finalize_chapter(pending, chapters[-2][:2] if len(chapters) > 1 else None, None)
+
+        # Sort years and tags once for all the index pages
+        sorted_years = sorted(posts_by_year.items(), reverse=True)
+        sorted_tags = sorted(all_tags)
+        tag_freq = {tag: len(tag_to_posts[tag]) for tag in sorted_tags}
 
         # Create table of contents page
-        toc_page = self.create_toc_page(posts_by_year, all_tags, tag_to_posts)
+        toc_page = self.create_toc_page(sorted_years, sorted_tags)
         self.book.add_item(toc_page)
         toc_items.insert(0, epub.Link(toc_page.file_name, 'Table of Contents', toc_page.id))
 
         # Create tags page and tag-specific pages if there are tags
-        if all_tags:
+        tag_pages = []
+        if sorted_tags:
             # Create main tags page
-            tags_page = self.create_tags_page(all_tags, tag_to_posts)
+            tags_page = self.create_tags_page(sorted_tags, tag_freq)
             self.book.add_item(tags_page)
             toc_items.insert(1, epub.Link(tags_page.file_name, 'Tags', tags_page.id))
+            tag_pages.append(tags_page)
             
             # Create individual tag pages
-            for tag in all_tags:
+            for tag in sorted_tags:
                 tag_page = self.create_tag_posts_page(tag, tag_to_posts[tag])
                 self.book.add_item(tag_page)
+                tag_pages.append(tag_page)
 
         # Create table of contents
         self.book.toc = toc_items
@@ -457,17 +589,8 @@ class EPUBBuilder:
         )
         self.book.add_item(css)
 
-        # Collect all tag pages for the spine
-        tag_pages = []
-        if all_tags:
-            tag_pages.append(tags_page)
-            for tag in all_tags:
-                tag_page = self.create_tag_posts_page(tag, tag_to_posts[tag])
-                self.book.add_item(tag_page)
-                tag_pages.append(tag_page)
-
         # Create spine: nav, TOC, Tags, all tag pages, then chapters
-        self.book.spine = ['nav', toc_page] + tag_pages + chapters
+        self.book.spine = ['nav', toc_page] + tag_pages + [chapter_id for _, _, chapter_id in chapters]
 
         # Generate filename using blog name
         if not blog_name:
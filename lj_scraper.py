@@ -1,17 +1,41 @@
 import os
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
-from datetime import datetime
+import lxml.html
+from lxml import etree
+from datetime import datetime, timedelta
 import time
+import random
+import threading
 import re
+import html
+import codecs
 import logging
 from dateutil import parser
 import calendar
+from functools import lru_cache
+from collections import deque
+from itertools import islice
+from enum import Enum
 import json
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from login import login
 from getpass import getpass
 
+# orjson is optional; it parses JSON faster than the json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# requests-cache is optional; with it, re-runs read unchanged pages from disk
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -19,24 +43,154 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns for post URLs and filenames
+_POST_URL_RE = re.compile(r'\d+\.html$')
+_TITLE_STRIP_RE = re.compile(r'[^\w\s-]')
+_TITLE_DASH_RE = re.compile(r'[-\s]+')
+
+# Post containers on the main (skip=N) listing pages
+_POST_DIV_SELECTOR = 'div[class*="entry"], div[class*="b-singlepost"]'
+
+# Date formats used by LiveJournal themes, tried before the generic dateutil parser
+_LJ_DATE_FORMATS = (
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d %H:%M',
+    '%B %d %Y, %H:%M',
+    '%B %d, %Y %H:%M',
+    '%Y-%m-%d',
+)
+
+def _class_xpaths(*selectors):
+    """Compile (tag, class) pairs into XPaths for the first matching element.
+
+    Classes are matched as whole tokens, like BeautifulSoup's class_ filter.
+    The returned XPaths are meant to be tried in order of preference.
+    """
+    return tuple(
+        etree.XPath(f"(//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')])[1]")
+        for tag, cls in selectors
+    )
+
+# Selectors for the parts of a post page, most specific first
+_TITLE_SELECTORS = (
+    ('h1', 'entry-title'),
+    ('h1', 'b-singlepost-title'),
+    ('h1', 'b-singlepost-title-link'),
+    ('h1', 'b-singlepost-title-text'),
+    ('div', 'subject'),
+)
+_TITLE_XPATHS = _class_xpaths(*_TITLE_SELECTORS)
+_DATE_SELECTORS = (
+    ('time', 'b-singlepost-author-date'),
+    ('time', 'entry-date'),
+    ('time', 'b-singlepost-date'),
+    ('span', 'b-singlepost-date'),
+    ('time', 'b-singlepost-date-text'),
+    ('div', 'date'),
+)
+_DATE_XPATHS = _class_xpaths(*_DATE_SELECTORS)
+_TAGS_XPATHS = _class_xpaths(
+    ('div', 'b-singlepost-tags'),
+    ('div', 'entry-tags'),
+    ('ul', 'b-singlepost-tags-list'),
+)
+_CONTENT_XPATHS = (
+    etree.XPath("(//article[@class='b-singlepost-body entry-content e-content'])[1]"),
+    etree.XPath("(//article[contains(concat(' ', normalize-space(@class), ' '), ' b-singlepost-body ')"
+                " and contains(concat(' ', normalize-space(@class), ' '), ' entry-content ')])[1]"),
+) + _class_xpaths(
+    ('div', 'entry-content'),
+    ('div', 'b-singlepost-body'),
+    ('div', 'b-singlepost-bodytext'),
+    ('div', 'b-singlepost-body-text'),
+    ('div', 'b-singlepost-body-text-wrapper'),
+    ('div', 'entry_text'),
+)
+
+# Elements left out of the post text: scripts and embeds, "Read more" links and lj-cut wrappers
+_REMOVED_XPATH = etree.XPath(
+    ".//script | .//style | .//iframe"
+    " | .//a[contains(., 'Read more') or contains(., 'Читать дальше')]"
+    " | .//div[contains(concat(' ', normalize-space(@class), ' '), ' lj-cut ')]"
+)
+
+def _tag_class_re(tag, cls):
+    """Compile a regex for a (tag, class) pair, matched on the raw page bytes.
+
+    The first group is the element's leading text; the second group is only
+    set when the element holds nothing but text.
+    """
+    return re.compile(rb'<' + tag.encode() + rb'\b[^>]*\bclass="(?:[^"]*\s)?' + cls.encode()
+                      + rb'(?:\s[^"]*)?"[^>]*>([^<]*)(</' + tag.encode() + rb'>)?')
+
+# The same title and date elements as _TITLE_XPATHS and _DATE_XPATHS
+_TITLE_TAG_RES = tuple(_tag_class_re(tag, cls) for tag, cls in _TITLE_SELECTORS)
+_DATE_TAG_RES = tuple(_tag_class_re(tag, cls) for tag, cls in _DATE_SELECTORS)
+
+def _iter_text(elem, skipped):
+    """Yield the text nodes under elem, leaving out the elements in skipped and comments.
+
+    The text after a skipped element stays a separate node, instead of being
+    merged into the text before it as drop_tree() would do.
+    """
+    if elem.text:
+        yield elem.text
+    for child in elem:
+        if isinstance(child.tag, str) and child not in skipped:
+            yield from _iter_text(child, skipped)
+        if child.tail:
+            yield child.tail
+
+def _find_first(tree, xpaths):
+    """Return the element matched by the first XPath that matches anything."""
+    for xpath in xpaths:
+        found = xpath(tree)
+        if found:
+            return found[0]
+    return None
+
+@lru_cache(maxsize=4096)
+def _parse_date(date_text: str) -> datetime:
+    """Parse a post date, trying the known LiveJournal formats first."""
+    for fmt in _LJ_DATE_FORMATS:
+        try:
+            return datetime.strptime(date_text, fmt)
+        except ValueError:
+            pass
+    return parser.parse(date_text)
+
+# Expected types of the required config fields and scraping settings
+_REQUIRED_FIELDS = {
+    'blog_url': str,
+    'login': bool,
+    'date_range': dict,
+    'included_tags': list,
+    'excluded_tags': list,
+    'output_dir': str,
+    'scraping_settings': dict
+}
+_REQUIRED_SCRAPING_SETTINGS = {
+    'max_retries': int,
+    'request_timeout': (int, float),
+    'request_delay': (int, float),
+    'max_pages': int
+}
+
+def _check_types(values: Dict[str, Any], schema: Dict[str, Any], kind: str) -> None:
+    """Check that every key in schema is present in values with the expected type."""
+    for name, expected in schema.items():
+        if name not in values:
+            raise ValueError(f"Missing required {kind}: {name}")
+        if not isinstance(values[name], expected):
+            if isinstance(expected, tuple):
+                type_name = ' or '.join(t.__name__ for t in expected)
+            else:
+                type_name = expected.__name__
+            raise ValueError(f"Invalid type for {name}: expected {type_name}")
+
 def validate_config(config: Dict[str, Any]) -> None:
     """Validate the configuration dictionary."""
-    required_fields = {
-        'blog_url': str,
-        'login': bool,
-        'date_range': dict,
-        'included_tags': list,
-        'excluded_tags': list,
-        'output_dir': str,
-        'scraping_settings': dict
-    }
-    
-    # Check required fields
-    for field, field_type in required_fields.items():
-        if field not in config:
-            raise ValueError(f"Missing required field: {field}")
-        if not isinstance(config[field], field_type):
-            raise ValueError(f"Invalid type for {field}: expected {field_type.__name__}")
+    _check_types(config, _REQUIRED_FIELDS, 'field')
     
     # Validate date_range
     date_range = config['date_range']
@@ -51,36 +205,33 @@ def validate_config(config: Dict[str, Any]) -> None:
     except Exception as e:
         raise ValueError(f"Invalid date format: {str(e)}")
     
-    # Validate tag fields
-    if not isinstance(config['included_tags'], list):
-        raise ValueError("included_tags must be a list")
-    if not isinstance(config['excluded_tags'], list):
-        raise ValueError("excluded_tags must be a list")
-    
     # Check for conflicting tags (same tag in both included and excluded)
     conflicting_tags = set(config['included_tags']) & set(config['excluded_tags'])
     if conflicting_tags:
         raise ValueError(f"Conflicting tags found in both included_tags and excluded_tags: {conflicting_tags}")
     
     # Validate scraping_settings
-    required_scraping_settings = {
-        'max_retries': int,
-        'request_timeout': (int, float),
-        'request_delay': (int, float),
-        'max_pages': int
-    }
+    _check_types(config['scraping_settings'], _REQUIRED_SCRAPING_SETTINGS, 'scraping setting')
     
-    for setting, setting_type in required_scraping_settings.items():
-        if setting not in config['scraping_settings']:
-            raise ValueError(f"Missing required scraping setting: {setting}")
-        if not isinstance(config['scraping_settings'][setting], setting_type):
-            raise ValueError(f"Invalid type for {setting}: expected {setting_type.__name__}")
+    # Validate optional scraping settings
+    concurrency = config['scraping_settings'].get('concurrency')
+    if concurrency is not None and (not isinstance(concurrency, int) or concurrency < 1):
+        raise ValueError("concurrency must be a positive integer")
+    for setting in ('min_delay', 'max_delay'):
+        value = config['scraping_settings'].get(setting)
+        if value is not None and (not isinstance(value, (int, float)) or value < 0):
+            raise ValueError(f"{setting} must be a non-negative number")
+    min_delay = config['scraping_settings'].get('min_delay')
+    max_delay = config['scraping_settings'].get('max_delay')
+    if min_delay is not None and max_delay is not None and min_delay > max_delay:
+        raise ValueError("min_delay must not be greater than max_delay")
 
 def load_config(config_path: str = 'config.json') -> Dict[str, Any]:
     """Load and validate configuration from JSON file."""
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        with open(config_path, 'rb') as f:
+            data = f.read()
+        config = orjson.loads(data) if orjson is not None else json.loads(data)
         
         validate_config(config)
         logger.info("Configuration loaded successfully")
@@ -88,7 +239,7 @@ def load_config(config_path: str = 'config.json') -> Dict[str, Any]:
     except FileNotFoundError:
         logger.error(f"Configuration file '{config_path}' not found")
         raise
-    except json.JSONDecodeError as e:
+    except json.JSONDecodeError as e:  # orjson.JSONDecodeError is a subclass
         logger.error(f"Invalid JSON in configuration file: {str(e)}")
         raise
     except ValueError as e:
@@ -98,6 +249,68 @@ def load_config(config_path: str = 'config.json') -> Dict[str, Any]:
         logger.error(f"Unexpected error loading configuration: {str(e)}")
         raise
 
+def _inside(content: bytes, pos: int, opener: bytes, closer: bytes) -> bool:
+    """Whether pos falls after an opener that isn't closed before it (e.g. inside a comment)."""
+    return content.rfind(opener, 0, pos) > content.rfind(closer, 0, pos)
+
+def _prefilter_date(content: bytes, encoding: str) -> Optional[Tuple[datetime, float]]:
+    """Find the post date on a raw post page without parsing the page.
+
+    Only the first selector of _DATE_XPATHS whose class appears in the page is
+    looked at, so a later selector never stands in for an element the regex
+    misses. Returns (post date, POSIX timestamp), or None when the date can't
+    be read this way; the full parse decides then.
+    """
+    for (_, cls), regex in zip(_DATE_SELECTORS, _DATE_TAG_RES):
+        cls_bytes = cls.encode()
+        if cls_bytes not in content:
+            continue
+        # More than one mention of the class can't be told apart without parsing
+        if content.count(cls_bytes) != 1:
+            return None
+        match = regex.search(content)
+        if not match or match.group(2) is None:
+            return None  # Quoted differently, or nested markup; leave it to the full parse
+        # Markup in comments and scripts isn't part of the parsed page
+        if (_inside(content, match.start(), b'<!--', b'-->')
+                or _inside(content, match.start(), b'<script', b'</script>')):
+            return None
+        date_text = html.unescape(match.group(1).decode(encoding, 'replace')).strip().replace('@', '')
+        try:
+            post_date = _parse_date(date_text)
+            return post_date, post_date.timestamp()
+        except (ValueError, OverflowError, OSError):
+            return None
+    return None
+
+def _bound_timestamp(value: datetime) -> float:
+    """POSIX timestamp of a date range bound; bounds too far out to convert lie beyond every post."""
+    try:
+        return value.timestamp()
+    except (ValueError, OverflowError, OSError):
+        return float('-inf') if value.year < 1970 else float('inf')
+
+class _ThrottledAdapter(HTTPAdapter):
+    """HTTP adapter that waits for the scraper's next request slot before sending.
+
+    Only requests that go out to the network pass through the adapter, so
+    pages served from the HTTP cache are not delayed.
+    """
+    def __init__(self, wait_turn, **kwargs):
+        self._wait_turn = wait_turn
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        self._wait_turn()
+        return super().send(request, **kwargs)
+
+class Status(Enum):
+    """Outcome of extracting a post."""
+    OK = 'ok'                      # Post extracted
+    SKIP = 'skip'                  # Post not wanted or not readable, carry on with the next one
+    BEFORE_RANGE = 'before_range'  # Post from before the start date
+    AFTER_RANGE = 'after_range'    # Post from on or after the end date
+
 class LJScraper:
     def __init__(self, config: Dict[str, Any]):
         self.config = config
@@ -108,14 +321,41 @@ class LJScraper:
         self.output_dir = config['output_dir'] + os.path.sep + self.journal_name
         self.start_date = parser.parse(config['date_range']['start_date'])
         self.end_date = parser.parse(config['date_range']['end_date'])
-        self.included_tags = config['included_tags']
-        self.excluded_tags = config['excluded_tags']
+        # Formatted once for log messages
+        self.start_date_str = self.start_date.strftime('%Y-%m-%d')
+        self.end_date_str = self.end_date.strftime('%Y-%m-%d')
+        # POSIX timestamps, so each post's date is checked with float comparisons
+        self._start_ts = _bound_timestamp(self.start_date)
+        self._end_ts = _bound_timestamp(self.end_date)
+        self.included_tags = set(config['included_tags'])
+        self.excluded_tags = set(config['excluded_tags'])
+        # Sorted copies, only used in log messages
+        self.included_tags_str = ', '.join(sorted(self.included_tags))
+        self.excluded_tags_str = ', '.join(sorted(self.excluded_tags))
         self.scraping_settings = config['scraping_settings']
+        self.max_retries = self.scraping_settings['max_retries']
+        self.request_timeout = self.scraping_settings['request_timeout']
+        self.request_delay = self.scraping_settings['request_delay']
+        self.max_pages = self.scraping_settings['max_pages']
+        # Number of posts fetched at the same time
+        self.concurrency = self.scraping_settings.get('concurrency', 1)
+        # Pause between requests, adapted to how the server is coping (see _record_success/_back_off)
+        self._min_delay = self.scraping_settings.get('min_delay', self.request_delay)
+        self._max_delay = self.scraping_settings.get('max_delay', 60)
+        self._delay = min(max(self.request_delay, self._min_delay), self._max_delay)
+        self._avg_latency = None
+        # Earliest time (time.monotonic) the next request may go out, shared by all workers
+        self._next_request = 0.0
+        self._delay_lock = threading.Lock()
         
         # Create output directory if it doesn't exist
         if not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
             logger.info(f"Created output directory: {self.output_dir}")
+
+        # Names of the posts already saved, so existence checks don't hit the filesystem
+        with os.scandir(self.output_dir) as entries:
+            self._existing = {entry.name for entry in entries if entry.name.endswith('.md')}
         
         if self.login:
             print("Authentication with LiveJournal requested")
@@ -126,33 +366,102 @@ class LJScraper:
             print("Authentication not requested - only public posts will be scraped")
             self.cookies = {}
 
-    def get_page_content(self, url):
-        """Fetch the content of a page with error handling and retries."""
-        for attempt in range(self.scraping_settings['max_retries']):
+        # One session for the whole scrape so connections to the blog are kept alive.
+        # Logged-in runs aren't cached: cache keys ignore cookies, so they would share
+        # pages with anonymous runs, and the session cookie would be stored in the cache
+        if requests_cache is not None and not self.login:
+            self.session = requests_cache.CachedSession(
+                cache_name=os.path.join(self.output_dir, '.httpcache'),
+                backend='sqlite',
+                expire_after=timedelta(days=7),
+                cache_control=True,
+                # Only post pages: listing and archive pages change as new posts appear
+                filter_fn=lambda response: _POST_URL_RE.search(response.url) is not None,
+            )
+        else:
+            self.session = requests.Session()
+        adapter = _ThrottledAdapter(self._wait_turn, pool_connections=10, pool_maxsize=max(20, self.concurrency), max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        })
+        self.session.cookies.update(self.cookies)
+
+    def _record_success(self, latency: float):
+        """Shrink the delay a step towards min_delay while the server answers quickly."""
+        with self._delay_lock:
+            if self._avg_latency is None:
+                self._avg_latency = latency
+            else:
+                self._avg_latency = 0.8 * self._avg_latency + 0.2 * latency
+            if latency <= self._avg_latency:
+                self._delay = max(self._min_delay, self._delay - 0.1)
+
+    def _back_off(self):
+        """Double the delay (up to max_delay) after the server asked us to slow down."""
+        with self._delay_lock:
+            self._delay = min(self._max_delay, max(self._delay, 0.1) * 2)
+            logger.warning(f"Server is rate limiting, delay between requests is now {self._delay:.1f}s")
+
+    def _wait_turn(self):
+        """Wait until the next request slot, keeping the delay between requests across all workers."""
+        with self._delay_lock:
+            now = time.monotonic()
+            start = max(now, self._next_request)
+            self._next_request = start + self._delay
+        if start > now:
+            time.sleep(start - now)
+
+    def get_page_content(self, url) -> Tuple[Optional[bytes], Optional[str]]:
+        """Fetch the raw (bytes) content of a page with error handling and retries.
+
+        Returns (content, encoding), with the encoding taken from the Content-Type
+        header ('utf-8' if it has no charset or one Python doesn't know), or
+        (None, None) on failure.
+        """
+        for attempt in range(self.max_retries):
             try:
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                }
-                response = requests.get(url, headers=headers, cookies=self.cookies, timeout=self.scraping_settings['request_timeout'])
+                response = self.session.get(url, timeout=self.request_timeout)
                 response.raise_for_status()
-                return response.text
+                self._record_success(response.elapsed.total_seconds())
+                # Hand the raw bytes and the header charset to the parsers,
+                # which skips requests' encoding detection
+                encoding = 'utf-8'
+                if 'charset' in response.headers.get('Content-Type', ''):
+                    try:
+                        encoding = codecs.lookup(response.encoding).name
+                    except LookupError:
+                        logger.warning(f"Unknown charset {response.encoding!r} for {url}, assuming utf-8")
+                return response.content, encoding
             except requests.RequestException as e:
-                if attempt == self.scraping_settings['max_retries'] - 1:
-                    logger.error(f"Failed to fetch {url} after {self.scraping_settings['max_retries']} attempts: {e}")
-                    return None
-                time.sleep(2 ** attempt)  # Exponential backoff
+                if attempt == self.max_retries - 1:
+                    logger.error(f"Failed to fetch {url} after {self.max_retries} attempts: {e}")
+                    return None, None
+                wait = 2 ** attempt  # Exponential backoff
+                if e.response is not None and e.response.status_code in (429, 503):
+                    self._back_off()
+                    try:
+                        wait = float(e.response.headers.get('Retry-After', wait))
+                    except ValueError:
+                        pass  # Retry-After given as an HTTP date
+                time.sleep(wait + random.uniform(0, 1))
+        return None, None
 
     def get_post_urls(self, skip=0):
-        """Get post URLs from the main page using skip parameter for pagination."""
+        """Get (post URL, post date) pairs from the main page using skip parameter for pagination.
+
+        The date is None when the listing doesn't show one.
+        """
         url = f"{self.base_url}/?skip={skip}"
-        content = self.get_page_content(url)
+        content, encoding = self.get_page_content(url)
         if not content:
             return []
 
-        soup = BeautifulSoup(content, 'html.parser')
+        soup = BeautifulSoup(content, 'lxml', from_encoding=encoding)
         post_urls = []
-        # Each post is in a div with class 'entry' or 'b-singlepost'
-        post_divs = soup.find_all('div', class_=lambda c: c and ('entry' in c or 'b-singlepost' in c))
+        # Each post is in a div with a class containing 'entry' or 'b-singlepost'
+        post_divs = soup.select(_POST_DIV_SELECTOR)
         
         for post_div in post_divs:
             # Find the date first to check if we should process this post
@@ -164,15 +473,17 @@ class LJScraper:
                 post_div.find('time', class_='b-singlepost-date-text')
             )
             
+            post_date = None
             if date_elem:
                 try:
-                    post_date = parser.parse(date_elem.text.strip())
+                    post_date = _parse_date(date_elem.text.strip())
+                    post_ts = post_date.timestamp()
                     # Skip if post is before start date
-                    if self.start_date and post_date < self.start_date:
-                        logger.info(f"Found post from {post_date.strftime('%Y-%m-%d')} - before start date {self.start_date.strftime('%Y-%m-%d')}, stopping")
+                    if post_ts < self._start_ts:
+                        logger.info(f"Found post from {post_date.strftime('%Y-%m-%d')} - before start date {self.start_date_str}, stopping")
                         return []  # Return empty list to stop processing
                     # Skip if post is on or after end date
-                    if self.end_date and post_date >= self.end_date:
+                    if post_ts >= self._end_ts:
                         continue
                 except:
                     logger.warning(f"Could not parse date: {date_elem.text.strip()}")
@@ -195,152 +506,142 @@ class LJScraper:
             # Normalize by removing fragment
             post_url = post_url.split('#')[0]
             # Only include URLs that look like post URLs (contain numbers)
-            if re.search(r'\d+\.html$', post_url):
-                post_urls.append(post_url)
+            if _POST_URL_RE.search(post_url):
+                post_urls.append((post_url, post_date))
                 
         logger.info(f"Found {len(post_urls)} post URLs at skip={skip}")
         return post_urls
 
-    def extract_post_content(self, post_url):
-        """Extract the main content of a post."""
+    def extract_post_content(self, post_url, known_date=None):
+        """Extract the main content of a post.
+
+        known_date is the post date already parsed (and checked against the
+        date range) from a listing page; when given, the date on the post
+        page isn't parsed again.
+
+        Returns (status, post data); the post data is None unless status is OK.
+        """
         # Skip non-post URLs
-        if not re.search(r'\d+\.html$', post_url):
+        if not _POST_URL_RE.search(post_url):
             logger.info(f"Skipping non-post URL: {post_url}")
-            return None
+            return Status.SKIP, None
             
         full_post_url = post_url.split('#')[0]
-        content = self.get_page_content(full_post_url)
+        content, encoding = self.get_page_content(full_post_url)
         if not content:
-            return None
+            return Status.SKIP, None
+
+        # Check the date on the raw page first, so out-of-range posts skip the full parse
+        # (pages without a title are left to the full parse, which skips them)
+        if known_date is None and any(regex.search(content) for regex in _TITLE_TAG_RES):
+            prefiltered = _prefilter_date(content, encoding)
+            if prefiltered is not None:
+                post_date, post_ts = prefiltered
+                date = post_date.strftime("%Y-%m-%d")
+                if post_ts < self._start_ts:
+                    logger.info(f"Found post from {date} - before start date {self.start_date_str}")
+                    return Status.BEFORE_RANGE, None
+                if post_ts >= self._end_ts:
+                    logger.info(f"Found post from {date} - on or after end date {self.end_date_str}")
+                    return Status.AFTER_RANGE, None
 
-        soup = BeautifulSoup(content, 'html.parser')
+        try:
+            tree = lxml.html.fromstring(content, parser=lxml.html.HTMLParser(encoding=encoding))
+        except etree.ParserError:
+            logger.info(f"Skipping empty page: {post_url}")
+            return Status.SKIP, None
         
         # Find the post title
-        title_elem = (
-            soup.find('h1', class_='entry-title') or
-            soup.find('h1', class_='b-singlepost-title') or
-            soup.find('h1', class_='b-singlepost-title-link') or
-            soup.find('h1', class_='b-singlepost-title-text') or
-            soup.find('div', class_='subject')
-        )
-        if not title_elem:
+        title_elem = _find_first(tree, _TITLE_XPATHS)
+        if title_elem is None:
             logger.info(f"Skipping page without title: {post_url}")
-            return None
+            return Status.SKIP, None
             
-        title = title_elem.text.strip()
+        title = title_elem.text_content().strip()
         logger.info(f"Found title: {title}")
         
-        # Find the post date
-        date_elem = (
-            soup.find('time', class_='b-singlepost-author-date') or
-            soup.find('time', class_='entry-date') or
-            soup.find('time', class_='b-singlepost-date') or
-            soup.find('span', class_='b-singlepost-date') or
-            soup.find('time', class_='b-singlepost-date-text') or
-            soup.find('div', class_='date')
-        )
-        if not date_elem:
-            logger.info(f"Skipping page without date: {post_url}")
-            return None
+        if known_date is not None:
+            # Already checked against the date range on the listing page
+            post_date = known_date
+            date = post_date.strftime("%Y-%m-%d")
+        else:
+            # Find the post date
+            date_elem = _find_first(tree, _DATE_XPATHS)
+            if date_elem is None:
+                logger.info(f"Skipping page without date: {post_url}")
+                return Status.SKIP, None
             
-        # Extract date from the time element's text
-        date_text = date_elem.text.strip()
+            # Extract date from the time element's text
+            date_text = date_elem.text_content().strip()
         
-        # With certain themes there can be an @ between the date and the time
-        date_text = date_text.replace('@', '')
+            # With certain themes there can be an @ between the date and the time
+            date_text = date_text.replace('@', '')
         
-        # Parse the date using dateutil
-        try:
-            post_date = parser.parse(date_text)
+            # Parse the date using dateutil
+            try:
+                post_date = _parse_date(date_text)
+                post_ts = post_date.timestamp()
+            except (ValueError, OverflowError, OSError):
+                logger.info(f"Skipping page with invalid date: {post_url}")
+                return Status.SKIP, None
             date = post_date.strftime("%Y-%m-%d")
             
             # Log the date comparison details
             logger.info(f"Date comparison for post {title}:")
             logger.info(f"- Post date: {date}")
-            logger.info(f"- Start date: {self.start_date.strftime('%Y-%m-%d')}")
-            logger.info(f"- End date: {self.end_date.strftime('%Y-%m-%d')}")
+            logger.info(f"- Start date: {self.start_date_str}")
+            logger.info(f"- End date: {self.end_date_str}")
             
-            # Check if post is within date range
-            if self.start_date and post_date < self.start_date:
-                logger.info(f"Found post from {date} - before start date {self.start_date.strftime('%Y-%m-%d')}, stopping")
-                raise StopIteration  # This will be caught by the caller to stop processing
+            # Check if post is within date range; the caller decides whether to stop
+            if post_ts < self._start_ts:
+                logger.info(f"Found post from {date} - before start date {self.start_date_str}")
+                return Status.BEFORE_RANGE, None
             
-            if self.end_date and post_date >= self.end_date:
-                logger.info(f"Found post from {date} - on or after end date {self.end_date.strftime('%Y-%m-%d')}, stopping")
-                raise StopIteration  # Stop processing when we find posts after end date
-                
-            logger.info(f"Post date {date} is within range")
-        except StopIteration:
-            raise  # Re-raise StopIteration to be caught by the caller
-        except:
-            logger.info(f"Skipping page with invalid date: {post_url}")
-            return None
+            if post_ts >= self._end_ts:
+                logger.info(f"Found post from {date} - on or after end date {self.end_date_str}")
+                return Status.AFTER_RANGE, None
             
+            logger.info(f"Post date {date} is within range")
+
         logger.info(f"Found date: {date}")
 
         # Find the tags
-        tags_elem = (
-            soup.find('div', class_='b-singlepost-tags') or
-            soup.find('div', class_='entry-tags') or
-            soup.find('ul', class_='b-singlepost-tags-list')
-        )
+        tags_elem = _find_first(tree, _TAGS_XPATHS)
         
-        if tags_elem:
+        if tags_elem is not None:
             # Extract all tags
-            tags = [tag.text.strip() for tag in tags_elem.find_all('a')]
+            tags = [tag.text_content().strip() for tag in tags_elem.iter('a')]
             logger.info(f"Found tags: {', '.join(tags)}")
             
             # Skip if any excluded tag is present
-            if self.excluded_tags and any(tag in self.excluded_tags for tag in tags):
-                logger.info(f"Skipping post with excluded tag(s): {', '.join(self.excluded_tags)}")
-                return None
+            if not self.excluded_tags.isdisjoint(tags):
+                logger.info(f"Skipping post with excluded tag(s): {self.excluded_tags_str}")
+                return Status.SKIP, None
             
             # Skip if included_tags is specified and post doesn't have any of the required tags
-            if self.included_tags and not any(tag in self.included_tags for tag in tags):
-                logger.info(f"Skipping post without required tag(s): {', '.join(self.included_tags)}")
-                return None
+            if self.included_tags and self.included_tags.isdisjoint(tags):
+                logger.info(f"Skipping post without required tag(s): {self.included_tags_str}")
+                return Status.SKIP, None
         else:
             logger.info("No tags found")
             tags = []
             
             # If included_tags is specified and post has no tags, skip it
             if self.included_tags:
-                logger.info(f"Skipping post without tags (required tags: {', '.join(self.included_tags)})")
-                return None
+                logger.info(f"Skipping post without tags (required tags: {self.included_tags_str})")
+                return Status.SKIP, None
         
         # Find the main content using the most precise selector
-        content_elem = soup.find('article', class_='b-singlepost-body entry-content e-content')
-        if not content_elem:
-            # Try less strict matching for the article
-            articles = soup.find_all('article')
-            for art in articles:
-                classes = art.get('class', [])
-                if 'b-singlepost-body' in classes and 'entry-content' in classes:
-                    content_elem = art
-                    break
-        if not content_elem:
-            # Fallback to previous logic
-            content_elem = (
-                soup.find('div', class_='entry-content') or
-                soup.find('div', class_='b-singlepost-body') or
-                soup.find('div', class_='b-singlepost-bodytext') or
-                soup.find('div', class_='b-singlepost-body-text') or
-                soup.find('div', class_='b-singlepost-body-text-wrapper') or
-                soup.find('div', class_='entry_text')
-            )
-        if not content_elem:
+        # (the exact article class first, then looser article and div matches)
+        content_elem = _find_first(tree, _CONTENT_XPATHS)
+        if content_elem is None:
             logger.error("Could not find content element")
-            return None
-        # Clean up the content
-        for tag in content_elem.find_all(['script', 'style', 'iframe']):
-            tag.decompose()
-        for tag in content_elem.find_all('a', string=lambda s: s and ('Read more' in s or 'Читать дальше' in s)):
-            tag.decompose()
-        for tag in content_elem.find_all('div', class_='lj-cut'):
-            tag.decompose()
-        post_content = content_elem.get_text(separator='\n', strip=True)
+            return Status.SKIP, None
+        # Clean up the content, one line per text node
+        skipped = set(_REMOVED_XPATH(content_elem))
+        post_content = '\n'.join(text.strip() for text in _iter_text(content_elem, skipped) if text.strip())
         logger.info(f"Extracted content length: {len(post_content)} characters")
-        return {
+        return Status.OK, {
             'title': title,
             'date': date,
             'content': post_content,
@@ -355,40 +656,29 @@ class LJScraper:
             return False
 
         # Create a safe filename from the title
-        safe_title = re.sub(r'[^\w\s-]', '', post_data['title'])
-        safe_title = re.sub(r'[-\s]+', '-', safe_title).strip('-_')
+        safe_title = _TITLE_STRIP_RE.sub('', post_data['title'])
+        safe_title = _TITLE_DASH_RE.sub('-', safe_title).strip('-_')
         
         # Create filename with date prefix and .md extension
         filename = f"{post_data['date']}_{safe_title}.md"
         filepath = os.path.join(self.output_dir, filename)
 
         # Check if file already exists
-        if os.path.exists(filepath):
+        if filename in self._existing:
             logger.warning(f"File already exists: {filename}")
             return False
 
         try:
+            # Always include tags, using "None" if no tags are present
+            tags_line = f'tags: {", ".join(post_data["tags"])}\n' if post_data['tags'] else 'tags: None\n'
+            # YAML front matter followed by the post content
+            payload = (
+                f'---\ntitle: {post_data["title"]}\ndate: {post_data["date"]}\n'
+                f'url: {post_data["url"]}\n{tags_line}---\n\n{post_data["content"]}'
+            )
             with open(filepath, 'w', encoding='utf-8') as f:
-                # Write YAML front matter
-                f.write('---\n')
-                f.write(f'title: {post_data["title"]}\n')
-                f.write(f'date: {post_data["date"]}\n')
-                f.write(f'url: {post_data["url"]}\n')
-                # Always include tags, using "None" if no tags are present
-                if post_data['tags']:
-                    f.write(f'tags: {", ".join(post_data["tags"])}\n')
-                else:
-                    f.write('tags: None\n')
-                f.write('---\n\n')
-                
-                # Write content with proper markdown formatting
-                content = post_data['content']
-                
-                # Split content into paragraphs and format
-                paragraphs = content.split('\n\n')
-                formatted_content = '\n\n'.join(paragraphs)
-                
-                f.write(formatted_content)
+                f.write(payload)
+            self._existing.add(filename)
                 
             logger.info(f"Successfully saved post to {filename}")
             return True
@@ -404,18 +694,18 @@ class LJScraper:
         url = f"{self.base_url}/{year}/{month:02d}/"
         logger.info(f"Fetching monthly archive: {url}")
         
-        content = self.get_page_content(url)
+        content, encoding = self.get_page_content(url)
         if not content:
             return []
 
-        soup = BeautifulSoup(content, 'html.parser')
+        soup = BeautifulSoup(content, 'lxml', from_encoding=encoding)
         post_urls = []
         
         # Find all post links in the monthly archive
         for link in soup.find_all('a', href=True):
             post_url = link['href']
             # Only include URLs that look like post URLs (contain numbers)
-            if re.search(r'\d+\.html$', post_url):
+            if _POST_URL_RE.search(post_url):
                 # Normalize by removing fragment
                 post_url = post_url.split('#')[0]
                 # Only include URLs from the same blog
@@ -427,58 +717,98 @@ class LJScraper:
         logger.info(f"Found {len(post_urls)} unique post URLs in {year}/{month}")
         return post_urls
 
+    def fetch_post(self, post_url, known_date=None):
+        """Fetch and parse a single post."""
+        logger.info(f"Processing post: {post_url}")
+        return self.extract_post_content(post_url, known_date)
+
+    def fetch_monthly_archive(self, year_month: Tuple[int, int]) -> List[str]:
+        """Fetch post URLs for one (year, month)."""
+        year, month = year_month
+        logger.info(f"Processing {year}/{month:02d}")
+        return self.get_post_urls_from_monthly_archive(year, month)
+
+    def process_posts(self, posts: List[Tuple[str, Optional[datetime]]], stop_on: Status,
+                      posts_saved: int = 0) -> Tuple[int, int, bool]:
+        """Fetch posts concurrently and save them in their original order.
+
+        posts holds (post URL, known post date or None) pairs. stop_on is the
+        out-of-range status that ends the run: BEFORE_RANGE when the posts go
+        from newest to oldest, AFTER_RANGE when they go from oldest to newest.
+        Posts out of range on the other side are skipped, as are posts that
+        fail with an unexpected error.
+        Returns (posts attempted, posts saved, whether the end of the date range was reached).
+        """
+        attempted = 0
+        saved = 0
+        remaining = iter(posts)
+        # Posts submitted but not saved yet, capped so a long archive isn't queued all at once
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            def submit(count):
+                for post_url, known_date in islice(remaining, count):
+                    pending.append((post_url, executor.submit(self.fetch_post, post_url, known_date)))
+
+            try:
+                submit(2 * self.concurrency)
+                while pending:
+                    post_url, future = pending.popleft()
+                    submit(1)
+                    try:
+                        status, post_data = future.result()
+                    except Exception as e:
+                        logger.error(f"Error processing post {post_url}: {str(e)}")
+                        status, post_data = Status.SKIP, None
+                    attempted += 1
+
+                    if status is stop_on:
+                        return attempted, saved, True
+
+                    if post_data:
+                        if self.save_post(post_data):
+                            saved += 1
+                            logger.info(f"Successfully saved post {posts_saved + saved}")
+                        else:
+                            logger.warning(f"Failed to save post: {post_url}")
+                    else:
+                        logger.info(f"Skipped post: {post_url}")
+            finally:
+                # Don't fetch the posts that haven't been started yet
+                for _, future in pending:
+                    future.cancel()
+        return attempted, saved, False
+
     def scrape_old_posts(self):
         """Scrape older posts using monthly archive structure."""
         if not self.start_date or not self.end_date:
             logger.error("Start and end dates are required for old posts scraping")
             return
 
-        posts_saved = 0
-        posts_attempted = 0
-        current_year = self.start_date.year
-        current_month = self.start_date.month
-
-        while current_year <= self.end_date.year:
-            while current_month <= 12:
-                if current_year == self.end_date.year and current_month > self.end_date.month:
-                    logger.info(f"Stopping processing at {current_year}-{current_month}")
-                    break
-
-                if current_year == self.start_date.year and current_month < self.start_date.month:
-                    current_month += 1
-                    continue
-
-                logger.info(f"Processing {current_year}/{current_month:02d}")
-                post_urls = self.get_post_urls_from_monthly_archive(current_year, current_month)
-
-                try:
-                    for post_url in post_urls:
-                        logger.info(f"Processing post: {post_url}")
-                        post_data = self.extract_post_content(post_url)
-                        posts_attempted += 1
-
-                        if post_data:
-                            if self.save_post(post_data):
-                                posts_saved += 1
-                                logger.info(f"Successfully saved post {posts_saved}")
-                            else:
-                                logger.warning(f"Failed to save post: {post_url}")
-                        else:
-                            logger.info(f"Skipped post: {post_url}")
-
-                        time.sleep(self.scraping_settings['request_delay'])  # Be nice to the server
-                except StopIteration:
-                    logger.info("Reached end of date range, stopping gracefully")
-                    break
-
-                current_month += 1
-                time.sleep(self.scraping_settings['request_delay'])  # Be nice to the server
-
-            current_year += 1
-            current_month = 1
-
-        # Count actual files in the posts directory
-        actual_posts = len([f for f in os.listdir(self.output_dir) if f.endswith('.md')])
+        year, month = self.start_date.year, self.start_date.month
+        end = (self.end_date.year, self.end_date.month)
+
+        # Every month from the start date's month to the end date's month
+        months = []
+        while (year, month) <= end:
+            months.append((year, month))
+            month += 1
+            if month == 13:
+                year, month = year + 1, 1
+
+        # Archive pages are independent, so fetch them concurrently
+        # (requests are still spaced out by the shared request slots)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            archives = list(executor.map(self.fetch_monthly_archive, months))
+
+        # Process all posts in chronological month order, without duplicates
+        post_urls = list(dict.fromkeys(url for urls in archives for url in urls))
+        posts_attempted, posts_saved, reached_end = self.process_posts(
+            [(url, None) for url in post_urls], Status.AFTER_RANGE)
+        if reached_end:
+            logger.info("Reached end of date range, stopping gracefully")
+
+        # Count the posts in the output directory (tracked as they are saved)
+        actual_posts = len(self._existing)
         logger.info(f"\nScraping completed:")
         logger.info(f"- Attempted to process {posts_attempted} posts")
         logger.info(f"- Successfully saved {posts_saved} posts")
@@ -492,39 +822,27 @@ class LJScraper:
         posts_saved = 0
         posts_attempted = 0
 
-        while page_num <= self.scraping_settings['max_pages']:
+        while page_num <= self.max_pages:
             logger.info(f"Fetching page {page_num}...")
-            post_urls = self.get_post_urls(page_num)
-            if not post_urls:
+            # Posts outside the date range are already dropped by get_post_urls,
+            # so those are never fetched
+            posts = self.get_post_urls(page_num)
+            if not posts:
                 logger.info("No more posts found.")
                 break
 
             # Process each post URL immediately to check dates
-            try:
-                for post_url in post_urls:
-                    logger.info(f"Processing post: {post_url}")
-                    post_data = self.extract_post_content(post_url)
-                    posts_attempted += 1
-                    
-                    if post_data:
-                        if self.save_post(post_data):
-                            posts_saved += 1
-                            logger.info(f"Successfully saved post {posts_saved}")
-                        else:
-                            logger.warning(f"Failed to save post: {post_url}")
-                    else:
-                        logger.info(f"Skipped post: {post_url}")
-                    
-                    time.sleep(self.scraping_settings['request_delay'])  # Be nice to the server
-            except StopIteration:
+            attempted, saved, reached_end = self.process_posts(posts, Status.BEFORE_RANGE, posts_saved)
+            posts_attempted += attempted
+            posts_saved += saved
+            if reached_end:
                 logger.info("Reached end of date range, stopping gracefully")
                 break
             
             page_num += 1
-            time.sleep(self.scraping_settings['request_delay'])  # Be nice to the server
 
-        # Count actual files in the posts directory
-        actual_posts = len([f for f in os.listdir(self.output_dir) if f.endswith('.md')])
+        # Count the posts in the output directory (tracked as they are saved)
+        actual_posts = len(self._existing)
         logger.info(f"\nScraping completed:")
         logger.info(f"- Attempted to process {posts_attempted} posts")
         logger.info(f"- Successfully saved {posts_saved} posts")
@@ -548,8 +866,6 @@ def main():
         config = load_config()
         scraper = LJScraper(config)
         scraper.scrape_blog()
-    except StopIteration:
-        logger.info("Scraping completed - reached date range limit")
     except Exception as e:
         logger.error(f"Failed to run scraper: {str(e)}")
         raise
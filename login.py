@@ -26,9 +26,13 @@ headers = {
 
 
 def login(username: str, password: str):
+    # Reuse one connection for the cookie request and the login itself
+    session = requests.Session()
+    session.headers.update(headers)
+
     # Get a "luid" cookie so it'll accept our form login.
     try:
-        response = requests.get("https://www.livejournal.com/", headers=headers)
+        response = session.get("https://www.livejournal.com/")
     except Exception as e:
         # If attempt to reach LiveJournal fails, error out.
         print(f"Could not retrieve pre-connection cookie from www.livejournal.com. Error: {e}. Exiting.")
@@ -46,7 +50,7 @@ def login(username: str, password: str):
 
     print("Attempting to log in as", username)
     # Login with user credentials and retrieve the two cookies required for the main script functions
-    response = requests.post("https://www.livejournal.com/login.bml", data=credentials, cookies=cookies)
+    response = session.post("https://www.livejournal.com/login.bml", data=credentials, cookies=cookies)
 
     # If not successful, whine about it.
     if response.status_code != 200: